@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Python Music Player (Tkinter + pygame)
+File: artwork.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-19
+Updated: 2026-10-19
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Cover art extraction and a two-tier thumbnail cache.
+
+- Art is read from embedded tags (ID3 APIC, FLAC/Vorbis PICTURE, MP4 covr)
+  or a cover image next to the track (folder.jpg, cover.jpg, ...).
+- Thumbnails are downscaled once and stored on disk as PNG, keyed by the
+  SHA-1 of the source image so tracks sharing art share one file.
+- A bounded LRU of Tk `PhotoImage`s sits in front of the disk cache.
+
+Notes:
+- Extraction, hashing and resizing run on worker threads. Tk objects are
+  only created on the UI thread in `ArtworkLoader.drain()`.
+- Pillow is optional; without it artwork is disabled and the UI stays text-only.
+
+===========================================================================
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import io
+import os
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Generic, Hashable, Iterable, Optional, TypeVar
+
+from mutagen import File as MutagenFile
+
+from .config import ART_LRU_SIZE, ART_WORKERS, COVER_FILENAMES
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None  # type: ignore[assignment]
+
+HAVE_PIL = Image is not None
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_FRONT_COVER = 3  # ID3/FLAC picture type for "Cover (front)"
+
+
+class LRUCache(Generic[K, V]):
+    """Small bounded mapping that evicts the least recently used entry."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(1, capacity)
+        self._data: OrderedDict[K, V] = OrderedDict()
+
+    def get(self, key: K) -> Optional[V]:
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.capacity:
+            self._data.popitem(last=False)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# -------------------- extraction --------------------
+def _pick_picture(pictures: list[Any]) -> Optional[bytes]:
+    if not pictures:
+        return None
+    for pic in pictures:
+        if getattr(pic, "type", None) == _FRONT_COVER:
+            return bytes(pic.data)
+    return bytes(pictures[0].data)
+
+
+def _embedded_artwork(path: Path) -> Optional[bytes]:
+    try:
+        mf = MutagenFile(path)
+    except Exception:
+        return None
+    if mf is None:
+        return None
+
+    # FLAC exposes pictures on the file object itself
+    data = _pick_picture(list(getattr(mf, "pictures", None) or []))
+    if data:
+        return data
+
+    tags = getattr(mf, "tags", None)
+    if not tags:
+        return None
+
+    # ID3 (MP3, AIFF, ...)
+    if hasattr(tags, "getall"):
+        data = _pick_picture(tags.getall("APIC"))
+        if data:
+            return data
+
+    try:
+        # MP4/M4A
+        covr = tags.get("covr")
+        if covr:
+            return bytes(covr[0])
+        # Ogg Vorbis/Opus carry FLAC pictures as base64
+        blocks = tags.get("metadata_block_picture")
+        if blocks:
+            from mutagen.flac import Picture
+
+            return _pick_picture([Picture(base64.b64decode(b)) for b in blocks])
+    except Exception:
+        pass
+    return None
+
+
+def _folder_artwork(path: Path) -> Optional[bytes]:
+    for name in COVER_FILENAMES:
+        candidate = path.parent / name
+        try:
+            return candidate.read_bytes()
+        except OSError:
+            continue
+    return None
+
+
+def extract_artwork(path: Path) -> Optional[bytes]:
+    """Return raw cover image bytes for a track, or None if it has no art."""
+    return _embedded_artwork(path) or _folder_artwork(path)
+
+
+# -------------------- disk tier --------------------
+class ThumbnailCache:
+    """On-disk PNG thumbnails keyed by the content hash of the source image."""
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        return hashlib.sha1(data).hexdigest()
+
+    def path_for(self, digest: str, size: int) -> Path:
+        return self.cache_dir / f"{digest}_{size}.png"
+
+    def get(self, digest: str, size: int) -> Optional[bytes]:
+        try:
+            return self.path_for(digest, size).read_bytes()
+        except OSError:
+            return None
+
+    def put(self, digest: str, size: int, source: bytes) -> Optional[bytes]:
+        """Downscale `source` to fit `size` x `size`, store it and return PNG bytes."""
+        if not HAVE_PIL:
+            return None
+        try:
+            with Image.open(io.BytesIO(source)) as img:
+                img.thumbnail((size, size))
+                if img.mode not in ("RGB", "RGBA"):
+                    img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+                buf = io.BytesIO()
+                img.save(buf, format="PNG", optimize=True)
+        except Exception:
+            return None
+        png = buf.getvalue()
+
+        target = self.path_for(digest, size)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp.write_bytes(png)
+            os.replace(tmp, target)
+        except OSError:
+            pass  # cache is best-effort; still hand back the thumbnail
+        return png
+
+    def thumbnail(self, source: bytes, size: int) -> tuple[str, Optional[bytes]]:
+        digest = self.digest(source)
+        png = self.get(digest, size)
+        if png is None:
+            png = self.put(digest, size, source)
+        return digest, png
+
+
+# -------------------- memory tier + worker --------------------
+def _default_photo_factory(png: bytes) -> Any:
+    import tkinter as tk
+
+    return tk.PhotoImage(data=base64.b64encode(png).decode("ascii"))
+
+
+class ArtworkLoader:
+    """Resolve (track, size) -> PhotoImage without blocking the UI thread.
+
+    `request()` schedules work; `drain()` must be called from the Tk thread to
+    turn finished thumbnails into images. `get()` only consults memory.
+    """
+
+    def __init__(
+        self,
+        cache: ThumbnailCache,
+        lru_size: int = ART_LRU_SIZE,
+        max_workers: int = ART_WORKERS,
+        photo_factory: Callable[[bytes], Any] = _default_photo_factory,
+    ) -> None:
+        self.cache = cache
+        self._photos: LRUCache[tuple[str, int], Any] = LRUCache(lru_size)
+        self._digests: dict[Path, Optional[str]] = {}  # None -> track has no art
+        self._pending: set[tuple[Path, int]] = set()
+        self._wanted: dict[int, set[Path]] = {}  # size -> paths still worth loading
+        self._ready: queue.Queue[tuple[Path, int, Optional[str], Optional[bytes]]] = queue.Queue()
+        self._lock = threading.Lock()
+        self._photo_factory = photo_factory
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="artwork")
+
+    @property
+    def enabled(self) -> bool:
+        return HAVE_PIL
+
+    def get(self, path: Path, size: int) -> Optional[Any]:
+        digest = self._digests.get(path)
+        if digest is None:
+            return None
+        return self._photos.get((digest, size))
+
+    def has_no_art(self, path: Path) -> bool:
+        return path in self._digests and self._digests[path] is None
+
+    def request(self, path: Path, size: int) -> None:
+        if not self.enabled or self.has_no_art(path) or self.get(path, size) is not None:
+            return
+        key = (path, size)
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+        self._pool.submit(self._work, path, size)
+
+    def retain(self, size: int, paths: Iterable[Path]) -> None:
+        """Limit queued `size` jobs to `paths`; others are skipped when dequeued.
+
+        Sizes that never call this (e.g. the now-playing cover) are always loaded.
+        """
+        wanted = set(paths)
+        with self._lock:
+            self._wanted[size] = wanted
+
+    def pending(self) -> int:
+        """Jobs still running or finished but not yet drained."""
+        with self._lock:
+            return len(self._pending) + self._ready.qsize()
+
+    def drain(self, limit: int = 64) -> list[tuple[Path, int]]:
+        """Create PhotoImages for finished jobs; return the keys now available."""
+        done: list[tuple[Path, int]] = []
+        for _ in range(limit):
+            try:
+                path, size, digest, png = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            self._digests[path] = digest if png is not None else None
+            if digest is None or png is None:
+                continue
+            if (digest, size) not in self._photos:
+                try:
+                    self._photos.put((digest, size), self._photo_factory(png))
+                except Exception:
+                    self._digests[path] = None
+                    continue
+            done.append((path, size))
+        return done
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _work(self, path: Path, size: int) -> None:
+        with self._lock:
+            wanted = self._wanted.get(size)
+            if wanted is not None and path not in wanted:
+                # scrolled away before we got to it; a later request resubmits
+                self._pending.discard((path, size))
+                return
+        digest: Optional[str] = None
+        png: Optional[bytes] = None
+        try:
+            source = extract_artwork(path)
+            if source:
+                digest, png = self.cache.thumbnail(source, size)
+        except Exception:
+            pass
+        finally:
+            # publish before clearing `pending` so pending() never misses the job
+            self._ready.put((path, size, digest, png))
+            with self._lock:
+                self._pending.discard((path, size))
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Python Music Player (Tkinter + pygame)
+File: clock.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-19
+Updated: 2026-10-19
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Playback clock: interpolates the track position on `time.monotonic` and
+periodically reconciles it with the mixer.
+
+Notes:
+- pygame's `mixer.music.get_pos()` counts the ms of audio actually mixed
+  since the last `play()` (it is derived from the number of decoded samples
+  handed to the device), so `start + get_pos()` is the real audio position.
+  It is coarse (one mixer buffer) and comparatively expensive, which is why we
+  interpolate in between.
+- Reconciliation happens lazily inside `position()` at most every
+  `CLOCK_SYNC_S`; no extra timers or polling.
+- Small errors are slewed out by adjusting the clock rate (position never
+  jumps backwards); errors above `CLOCK_SNAP_S` snap to the mixer.
+- The long-run rate (audio clock vs. monotonic clock) is estimated from the
+  whole play segment, so multi-hour tracks don't accumulate drift.
+
+===========================================================================
+"""
+from __future__ import annotations
+
+import time
+from typing import Callable, Optional
+
+from .config import CLOCK_MAX_SLEW, CLOCK_SNAP_S, CLOCK_SLEW_S, CLOCK_SYNC_S
+
+_EMA_ALPHA = 0.2
+_RATE_MIN_BASELINE_S = 10.0  # don't estimate rate from shorter segments
+_RATE_LIMIT = 0.01  # base rate is clamped to 1 +/- this
+
+
+class PlaybackClock:
+    def __init__(self, now: Callable[[], float] = time.monotonic) -> None:
+        self._now = now
+        self.reset()
+
+    # ---------- control ----------
+    def reset(self, position: float = 0.0) -> None:
+        self._anchor_pos = position
+        self._anchor_t = self._now()
+        self._running = False
+        self._rate = 1.0  # current rate incl. slew correction
+        self._base_rate = 1.0  # long-run audio/monotonic ratio
+        self._segment_start = position  # position at the last play() (get_pos origin)
+        self._segment_mono = 0.0  # monotonic seconds spent running in this segment
+        self._segment_mark = self._anchor_t
+        self._last_sync = float("-inf")
+        self._last_error: Optional[float] = None
+        self._error_ema = 0.0
+
+    def start(self, position: float) -> None:
+        """Begin a new play segment at `position` (mixer `play()` was just called)."""
+        self.reset(position)
+        self._running = True
+
+    def pause(self) -> None:
+        if not self._running:
+            return
+        now = self._now()
+        self._anchor_pos = self._interpolate(now)
+        self._anchor_t = now
+        self._segment_mono += now - self._segment_mark
+        self._running = False
+
+    def resume(self) -> None:
+        if self._running:
+            return
+        now = self._now()
+        self._anchor_t = now
+        self._segment_mark = now
+        self._running = True
+
+    # ---------- reading ----------
+    def position(self, mixer_ms: Optional[Callable[[], int]] = None) -> float:
+        """Current position in seconds; reconciles with `mixer_ms()` when due."""
+        now = self._now()
+        if self._running and mixer_ms is not None and now - self._last_sync >= CLOCK_SYNC_S:
+            self._last_sync = now
+            ms = mixer_ms()
+            if ms >= 0:
+                self.sync(ms / 1000.0, now)
+        return self._interpolate(now)
+
+    @property
+    def error(self) -> float:
+        """Smoothed absolute difference to the mixer at recent syncs (seconds)."""
+        return self._error_ema
+
+    @property
+    def last_error(self) -> Optional[float]:
+        """Signed mixer - clock difference at the last sync, or None before any."""
+        return self._last_error
+
+    @property
+    def drift(self) -> float:
+        """Estimated long-run rate error of the monotonic clock vs. audio (ratio - 1)."""
+        return self._base_rate - 1.0
+
+    # ---------- reconciliation ----------
+    def sync(self, mixer_elapsed: float, now: Optional[float] = None) -> None:
+        """Reconcile with the mixer, given seconds mixed since the segment began."""
+        if not self._running:
+            return
+        now = self._now() if now is None else now
+        measured = self._segment_start + mixer_elapsed
+        predicted = self._interpolate(now)
+        err = measured - predicted
+        self._last_error = err
+        self._error_ema += _EMA_ALPHA * (abs(err) - self._error_ema)
+
+        mono = self._segment_mono + (now - self._segment_mark)
+        if mono >= _RATE_MIN_BASELINE_S and mixer_elapsed > 0:
+            ratio = mixer_elapsed / mono
+            self._base_rate = min(1.0 + _RATE_LIMIT, max(1.0 - _RATE_LIMIT, ratio))
+
+        if abs(err) > CLOCK_SNAP_S:
+            self._anchor_pos = measured
+            self._rate = self._base_rate
+        else:
+            self._anchor_pos = predicted
+            slew = max(-CLOCK_MAX_SLEW, min(CLOCK_MAX_SLEW, err / CLOCK_SLEW_S))
+            self._rate = self._base_rate * (1.0 + slew)
+        self._anchor_t = now
+
+    def _interpolate(self, now: float) -> float:
+        if not self._running:
+            return self._anchor_pos
+        return self._anchor_pos + (now - self._anchor_t) * self._rate
@@ -6,7 +6,7 @@ Project: Python Music Player (Tkinter + pygame)
 File: config.py
 Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
 Created: 2025-10-26
-Updated: 2025-10-26
+Updated: 2026-10-19
 License: MIT License (see LICENSE file for details)
 ===========================================================================
 
@@ -17,6 +17,43 @@ Centralized configuration and constants.
 """
 from __future__ import annotations
 
+import os
+from pathlib import Path
+
 SUPPORTED_EXTS = {".mp3", ".wav", ".flac", ".ogg", ".aac", ".m4a"}
 DEFAULT_VOLUME = 0.7  # 0..1
-TICK_MS = 500  # UI refresh rate for progress/position
\ No newline at end of file
+TICK_MS = 500  # UI refresh rate for progress/position
+
+# Artwork
+CACHE_DIR = Path.home() / ".cache" / "music_player"
+DATA_DIR = Path.home() / ".local" / "share" / "music_player"
+ART_CACHE_DIR = CACHE_DIR / "artwork"
+COVER_FILENAMES = ("folder.jpg", "cover.jpg", "front.jpg", "folder.png", "cover.png")
+NOW_PLAYING_ART_SIZE = 160  # px, square bounding box
+ROW_ART_SIZE = 32  # px, playlist column thumbnail
+ART_LRU_SIZE = 256  # PhotoImages kept in memory
+ART_WORKERS = 2
+ART_POLL_MS = 50  # how often the UI drains finished thumbnails while work is pending
+
+# Duplicate detection
+PARTIAL_BYTES = 64 * 1024  # bytes hashed at each end of the payload in the partial stage
+HASH_BUF_SIZE = 1024 * 1024  # fixed read buffer for streaming hashes
+DEDUPE_WORKERS = min(8, os.cpu_count() or 1)
+DEDUPE_DURATION_TOLERANCE = 1.0  # seconds; tags skew duration estimates between copies
+
+# Play history
+HISTORY_LOG = DATA_DIR / "history.jsonl"
+HISTORY_STATS = DATA_DIR / "history_stats.json"
+HISTORY_FLUSH_S = 30.0  # max seconds an event waits in memory
+HISTORY_BATCH = 20  # flush early once this many events are queued
+HISTORY_COMPACT_BYTES = 8 * 1024 * 1024  # rewrite the log past this size
+HISTORY_RETENTION_DAYS = 365  # events kept in the log; aggregates are all-time
+
+# Playback clock
+CLOCK_SYNC_S = 1.0  # min seconds between reconciliations with the mixer
+CLOCK_SNAP_S = 0.5  # errors above this jump straight to the mixer position
+CLOCK_SLEW_S = 2.0  # smaller errors are slewed out over about this long
+CLOCK_MAX_SLEW = 0.05  # max rate adjustment while slewing (5%)
+
+# Library
+LIBRARY_SCAN_WORKERS = 16  # roots scanned at the same time (one worker per root)
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Python Music Player (Tkinter + pygame)
+File: dedupe.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-19
+Updated: 2026-10-19
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Staged duplicate-track detection. Candidates are narrowed so each stage only
+reads what it needs:
+
+1. group by format + duration (already in `TrackMeta`, no file reads); tags
+   skew duration estimates, so neighbours within `DEDUPE_DURATION_TOLERANCE`
+   are grouped together. Tracks without a duration are grouped by payload
+   length, which only needs the container headers.
+2. payload length + hash of the first/last `PARTIAL_BYTES` of the audio data
+3. full hash of the audio data, streamed in `HASH_BUF_SIZE` chunks
+
+Tags (ID3v2/ID3v1/APEv2, FLAC metadata blocks, MP4 `moov`, RIFF chunks) are
+skipped, so copies that only differ in tagging are still detected. Stages 2
+and 3 hash files in parallel worker threads.
+
+Ogg (Vorbis/Opus) files are matched byte-for-byte: their comments live inside
+the Ogg pages, and retagging renumbers and re-checksums every following page,
+so there is no contiguous tag-free range to hash.
+
+Usage:
+python -m music_player.dedupe ~/Music
+
+===========================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import struct
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Hashable, Iterable, Optional
+
+from .config import DEDUPE_DURATION_TOLERANCE, DEDUPE_WORKERS, HASH_BUF_SIZE, PARTIAL_BYTES
+from .utils import TrackMeta, read_metadata, scan_folder
+
+
+# -------------------- payload location --------------------
+def _syncsafe(b: bytes) -> int:
+    return (b[0] << 21) | (b[1] << 14) | (b[2] << 7) | b[3]
+
+
+def _flac_payload_start(f, offset: int) -> int:
+    pos = offset + 4  # after b"fLaC"
+    while True:
+        f.seek(pos)
+        header = f.read(4)
+        if len(header) < 4:
+            return pos
+        pos += 4 + int.from_bytes(header[1:4], "big")
+        if header[0] & 0x80:  # last metadata block
+            return pos
+
+
+def _riff_payload_range(f, size: int) -> Optional[tuple[int, int]]:
+    pos = 12
+    while pos + 8 <= size:
+        f.seek(pos)
+        chunk_id, chunk_len = struct.unpack("<4sI", f.read(8))
+        if chunk_id == b"data":
+            return pos + 8, min(size, pos + 8 + chunk_len)
+        pos += 8 + chunk_len + (chunk_len & 1)
+    return None
+
+
+def _mp4_payload_range(f, size: int) -> Optional[tuple[int, int]]:
+    pos = 0
+    while pos + 8 <= size:
+        f.seek(pos)
+        atom_len, atom_type = struct.unpack(">I4s", f.read(8))
+        header = 8
+        if atom_len == 1:
+            atom_len = struct.unpack(">Q", f.read(8))[0]
+            header = 16
+        elif atom_len == 0:
+            atom_len = size - pos
+        if atom_len < header:
+            return None
+        if atom_type == b"mdat":
+            return pos + header, min(size, pos + atom_len)
+        pos += atom_len
+    return None
+
+
+def audio_payload_range(path: Path) -> tuple[int, int]:
+    """Return the [start, end) byte range holding audio data, skipping tags.
+
+    Only container headers are read. Unknown layouts (including Ogg) fall back
+    to the whole file.
+    """
+    size = path.stat().st_size
+    start, end = 0, size
+    with open(path, "rb") as f:
+        head = f.read(12)
+        if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+            return _riff_payload_range(f, size) or (0, size)
+        if head[4:8] == b"ftyp":
+            return _mp4_payload_range(f, size) or (0, size)
+
+        if head[:3] == b"ID3" and len(head) >= 10:
+            start = 10 + _syncsafe(head[6:10]) + (10 if head[5] & 0x10 else 0)
+            f.seek(start)
+            head = f.read(4)
+        if head[:4] == b"fLaC":
+            return _flac_payload_start(f, start), size
+
+        # trailing ID3v1 and APEv2 tags
+        if end - start >= 128:
+            f.seek(end - 128)
+            if f.read(3) == b"TAG":
+                end -= 128
+        if end - start >= 32:
+            f.seek(end - 32)
+            footer = f.read(32)
+            if footer[:8] == b"APETAGEX":
+                tag_len, _items, flags = struct.unpack("<III", footer[12:24])
+                end -= tag_len + (32 if flags & 0x80000000 else 0)
+    return start, max(start, end)
+
+
+# -------------------- hashing --------------------
+def _hash_range(f, start: int, end: int, h, buf: memoryview) -> None:
+    f.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        n = f.readinto(buf[: min(len(buf), remaining)])
+        if not n:
+            break
+        h.update(buf[:n])
+        remaining -= n
+
+
+def partial_hash(path: Path) -> Optional[tuple[int, str]]:
+    """(payload length, hash of the payload's head and tail) or None if unreadable."""
+    try:
+        start, end = audio_payload_range(path)
+        h = hashlib.blake2b(digest_size=16)
+        buf = memoryview(bytearray(min(HASH_BUF_SIZE, PARTIAL_BYTES)))
+        with open(path, "rb") as f:
+            if end - start <= 2 * PARTIAL_BYTES:
+                _hash_range(f, start, end, h, buf)
+            else:
+                _hash_range(f, start, start + PARTIAL_BYTES, h, buf)
+                _hash_range(f, end - PARTIAL_BYTES, end, h, buf)
+    except (OSError, struct.error):
+        return None
+    return end - start, h.hexdigest()
+
+
+def full_hash(path: Path) -> Optional[str]:
+    """Hash of the complete audio payload, or None if unreadable."""
+    try:
+        start, end = audio_payload_range(path)
+        h = hashlib.blake2b(digest_size=16)
+        buf = memoryview(bytearray(HASH_BUF_SIZE))
+        with open(path, "rb") as f:
+            _hash_range(f, start, end, h, buf)
+    except (OSError, struct.error):
+        return None
+    return h.hexdigest()
+
+
+# -------------------- pipeline --------------------
+def _payload_length(path: Path) -> Optional[int]:
+    try:
+        start, end = audio_payload_range(path)
+    except (OSError, struct.error):
+        return None
+    return end - start
+
+
+def _duration_groups(tracks: Iterable[TrackMeta]) -> tuple[list[list[Path]], list[list[Path]]]:
+    """Split tracks into (duration clusters, untimed groups), both per format.
+
+    Durations are sorted and chained: a track joins the current cluster when it
+    is within the tolerance of its predecessor. Clusters may be loose; stage 2
+    compares exact payload lengths anyway.
+    """
+    timed: dict[str, list[tuple[float, Path]]] = defaultdict(list)
+    untimed: dict[str, list[Path]] = defaultdict(list)
+    for t in tracks:
+        suffix = t.path.suffix.lower()
+        if t.duration:
+            timed[suffix].append((t.duration, t.path))
+        else:
+            untimed[suffix].append(t.path)
+
+    clusters: list[list[Path]] = []
+    for items in timed.values():
+        items.sort()
+        current: list[Path] = []
+        prev = None
+        for dur, path in items:
+            if prev is not None and dur - prev > DEDUPE_DURATION_TOLERANCE:
+                if len(current) > 1:
+                    clusters.append(current)
+                current = []
+            current.append(path)
+            prev = dur
+        if len(current) > 1:
+            clusters.append(current)
+    return clusters, [g for g in untimed.values() if len(g) > 1]
+
+
+def _refine(
+    groups: Iterable[list[Path]],
+    key: Callable[[Path], Optional[Hashable]],
+    pool: ThreadPoolExecutor,
+) -> list[list[Path]]:
+    """Split each group by `key` (computed in parallel); keep groups of 2+."""
+    tagged = [(gi, path) for gi, group in enumerate(groups) for path in group]
+    buckets: dict[Hashable, list[Path]] = defaultdict(list)
+    for (gi, path), k in zip(tagged, pool.map(key, [p for _, p in tagged])):
+        if k is not None:
+            buckets[(gi, k)].append(path)
+    return [b for b in buckets.values() if len(b) > 1]
+
+
+def find_duplicates(
+    tracks: Iterable[TrackMeta], workers: int = DEDUPE_WORKERS
+) -> list[list[Path]]:
+    """Return groups of paths with identical audio payloads.
+
+    Each group is sorted; the first path is treated as the one to keep.
+    """
+    groups, untimed = _duration_groups(tracks)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dedupe") as pool:
+        # st_size would include the tags, so untimed tracks need the payload length
+        groups += _refine(untimed, _payload_length, pool)
+        groups = _refine(groups, partial_hash, pool)
+        groups = _refine(groups, full_hash, pool)
+    return sorted(sorted(g) for g in groups)
+
+
+def find_duplicates_in_folders(
+    folders: Iterable[Path], workers: int = DEDUPE_WORKERS
+) -> list[list[Path]]:
+    """Headless entry: scan `folders`, read metadata and dedupe across all of them."""
+    paths = sorted({p for folder in folders for p in scan_folder(folder)})
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="metadata") as pool:
+        tracks = list(pool.map(read_metadata, paths))
+    return find_duplicates(tracks, workers=workers)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Report duplicate audio files.")
+    parser.add_argument("folders", nargs="+", type=Path)
+    parser.add_argument("-j", "--workers", type=int, default=DEDUPE_WORKERS)
+    args = parser.parse_args(argv)
+
+    groups = find_duplicates_in_folders(args.folders, workers=args.workers)
+    for group in groups:
+        print(group[0])
+        for dup in group[1:]:
+            print(f"  = {dup}")
+    extra = sum(len(g) - 1 for g in groups)
+    print(f"{len(groups)} duplicate groups, {extra} redundant files")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
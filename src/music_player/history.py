@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Python Music Player (Tkinter + pygame)
+File: history.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-19
+Updated: 2026-10-19
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Append-only play history with incrementally maintained aggregates.
+
+Files (under `DATA_DIR`):
+- history.jsonl       one JSON object per play; the first line is a header
+                      `{"gen": N}` identifying the log generation
+- history_stats.json  aggregates snapshot + the log generation/offset it covers
+
+Notes:
+- `record()` is cheap and safe to call from the UI thread: it updates the
+  in-memory aggregates and queues the event. A writer thread appends queued
+  events in batches and fsyncs, then snapshots the aggregates.
+- A torn last line (crash mid-write) is ignored and truncated on load.
+- When the log grows past `HISTORY_COMPACT_BYTES` it is rewritten without
+  events older than `HISTORY_RETENTION_DAYS`. All-time aggregates are kept
+  in the snapshot, so counts survive compaction.
+
+Usage:
+python -m music_player.history   # print a listening report
+
+===========================================================================
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from .config import (
+    HISTORY_BATCH,
+    HISTORY_COMPACT_BYTES,
+    HISTORY_FLUSH_S,
+    HISTORY_LOG,
+    HISTORY_RETENTION_DAYS,
+    HISTORY_STATS,
+)
+from .utils import hhmmss
+
+
+@dataclass
+class PlayEvent:
+    path: str
+    title: str
+    artist: Optional[str]
+    started: float  # epoch seconds
+    listened: float  # seconds
+    completed: bool  # False -> skipped
+
+
+class HistoryStats:
+    """All-time aggregates, updated one event at a time."""
+
+    def __init__(self) -> None:
+        self.track_plays: Counter[str] = Counter()
+        self.track_skips: Counter[str] = Counter()
+        self.artist_plays: Counter[str] = Counter()
+        self.titles: dict[str, str] = {}
+        self.total_listened: float = 0.0
+        self.events: int = 0
+
+    def apply(self, ev: PlayEvent) -> None:
+        self.events += 1
+        self.total_listened += max(0.0, ev.listened)
+        self.titles[ev.path] = ev.title
+        if ev.completed:
+            self.track_plays[ev.path] += 1
+            if ev.artist:
+                self.artist_plays[ev.artist] += 1
+        else:
+            self.track_skips[ev.path] += 1
+
+    def most_played_tracks(self, n: int = 10) -> list[tuple[str, int]]:
+        """(title, completed plays) for the top `n` tracks."""
+        return [(self.titles.get(p, p), c) for p, c in self.track_plays.most_common(n)]
+
+    def most_played_artists(self, n: int = 10) -> list[tuple[str, int]]:
+        return self.artist_plays.most_common(n)
+
+    def copy(self) -> HistoryStats:
+        other = HistoryStats()
+        other.track_plays = self.track_plays.copy()
+        other.track_skips = self.track_skips.copy()
+        other.artist_plays = self.artist_plays.copy()
+        other.titles = dict(self.titles)
+        other.total_listened = self.total_listened
+        other.events = self.events
+        return other
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "track_plays": self.track_plays,
+            "track_skips": self.track_skips,
+            "artist_plays": self.artist_plays,
+            "titles": self.titles,
+            "total_listened": self.total_listened,
+            "events": self.events,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> HistoryStats:
+        stats = cls()
+        stats.track_plays = Counter(data.get("track_plays", {}))
+        stats.track_skips = Counter(data.get("track_skips", {}))
+        stats.artist_plays = Counter(data.get("artist_plays", {}))
+        stats.titles = dict(data.get("titles", {}))
+        stats.total_listened = float(data.get("total_listened", 0.0))
+        stats.events = int(data.get("events", 0))
+        return stats
+
+
+def _parse(line: bytes) -> Optional[PlayEvent]:
+    try:
+        return PlayEvent(**json.loads(line))
+    except (ValueError, TypeError):
+        return None
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class PlayHistory:
+    """Buffered, crash-safe play log. Call `close()` on shutdown to flush."""
+
+    def __init__(
+        self,
+        log_path: Path = HISTORY_LOG,
+        stats_path: Path = HISTORY_STATS,
+        flush_interval: float = HISTORY_FLUSH_S,
+        batch_size: int = HISTORY_BATCH,
+        compact_bytes: int = HISTORY_COMPACT_BYTES,
+        retention_days: float = HISTORY_RETENTION_DAYS,
+    ) -> None:
+        self.log_path = log_path
+        self.stats_path = stats_path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.retention_s = retention_days * 86400
+        self._compact_at = compact_bytes
+        self._min_compact = compact_bytes
+
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()  # serializes writer thread and close()
+        self._wake = threading.Event()
+        self._closed = False
+        self._buffer: list[PlayEvent] = []
+
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self._gen = 0
+        self._offset = 0  # bytes of the log already folded into the snapshot
+        self.stats = HistoryStats()
+        self._load()
+
+        self._thread = threading.Thread(target=self._run, name="history", daemon=True)
+        self._thread.start()
+
+    # ---------- public ----------
+    def record(self, event: PlayEvent) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self.stats.apply(event)
+            self._buffer.append(event)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def flush(self) -> None:
+        with self._io_lock:
+            self._flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=5)
+        self.flush()
+
+    # ---------- writer thread ----------
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            with self._io_lock:
+                self._flush()
+                if self._offset > self._compact_at:
+                    try:
+                        self._compact()
+                    except OSError:
+                        # e.g. disk full: keep appending and retry once the log doubles
+                        self._compact_at = max(self._min_compact, 2 * self._offset)
+            with self._lock:
+                if self._closed:
+                    return
+
+    def _flush(self) -> None:
+        with self._lock:
+            if not self._buffer:
+                return
+            batch, self._buffer = self._buffer, []
+            snapshot = self.stats.copy()  # matches exactly what is in the log after this write
+        data = b"".join(
+            json.dumps(asdict(ev), ensure_ascii=False).encode("utf-8") + b"\n" for ev in batch
+        )
+        try:
+            with open(self.log_path, "ab") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+                self._offset = f.tell()
+        except OSError:
+            # keep the events for the next attempt; a partial line is skipped on load
+            with self._lock:
+                self._buffer[:0] = batch
+            return
+        try:
+            self._save_stats(snapshot)
+        except OSError:
+            pass  # the log is authoritative; the next snapshot catches up
+
+    def _save_stats(self, stats: HistoryStats) -> None:
+        payload = {"gen": self._gen, "offset": self._offset, "stats": stats.to_json()}
+        _write_atomic(self.stats_path, json.dumps(payload).encode("utf-8"))
+
+    # ---------- load / compaction ----------
+    def _header(self, gen: int) -> bytes:
+        return json.dumps({"gen": gen}).encode("utf-8") + b"\n"
+
+    def _load(self) -> None:
+        snap: Optional[dict[str, Any]] = None
+        try:
+            snap = json.loads(self.stats_path.read_bytes())
+        except (OSError, ValueError):
+            pass
+
+        if not self.log_path.exists():
+            self._gen = int(snap["gen"]) if snap else 0
+            self.log_path.write_bytes(self._header(self._gen))
+
+        with open(self.log_path, "r+b") as f:
+            first = f.readline()
+            try:
+                log_gen = int(json.loads(first)["gen"])
+            except (ValueError, KeyError, TypeError):
+                log_gen, first = 0, b""  # legacy/headerless log: replay everything
+            self._gen = log_gen
+
+            if snap and int(snap["gen"]) == log_gen:
+                self.stats = HistoryStats.from_json(snap["stats"])
+                f.seek(min(int(snap["offset"]), self.log_path.stat().st_size))
+            elif snap and int(snap["gen"]) > log_gen:
+                # crashed mid-compaction: snapshot already covers this log
+                self.stats = HistoryStats.from_json(snap["stats"])
+                self._gen = int(snap["gen"])
+                self._rewrite_log()
+                self._save_stats(self.stats)
+                return
+            else:
+                f.seek(len(first))
+
+            good = f.tell()
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn write
+                ev = _parse(line)
+                if ev is not None:
+                    self.stats.apply(ev)
+                good += len(line)
+            f.truncate(good)
+            self._offset = good
+        self._compact_at = max(self._min_compact, 2 * self._offset)
+
+    def _rewrite_log(self) -> None:
+        """Replace the log with a `self._gen` header plus events inside retention."""
+        cutoff = time.time() - self.retention_s
+        tmp = self.log_path.with_suffix(self.log_path.suffix + ".tmp")
+        try:
+            with open(self.log_path, "rb") as src, open(tmp, "wb") as dst:
+                dst.write(self._header(self._gen))
+                src.readline()
+                for line in src:
+                    ev = _parse(line) if line.endswith(b"\n") else None
+                    if ev is not None and ev.started >= cutoff:
+                        dst.write(line)
+                dst.flush()
+                os.fsync(dst.fileno())
+                offset = dst.tell()
+            os.replace(tmp, self.log_path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            raise
+        self._offset = offset
+        self._compact_at = max(self._min_compact, 2 * self._offset)
+
+    def _compact(self) -> None:
+        # Snapshot the next generation first: if we crash before the log is
+        # replaced, `_load()` sees a newer snapshot and finishes the rewrite.
+        with self._lock:
+            snapshot = self.stats.copy()
+            pending = len(self._buffer)
+        if pending:
+            return  # only compact when the snapshot covers the whole log
+        gen = self._gen
+        self._gen += 1
+        try:
+            self._save_stats(snapshot)
+            self._rewrite_log()
+        except OSError:
+            # the old log is still in place; the next flush rewrites the
+            # snapshot for it (and `_load()` copes with a newer one meanwhile)
+            self._gen = gen
+            raise
+        self._save_stats(snapshot)
+
+
+def report(stats: HistoryStats, n: int = 10) -> str:
+    lines = [f"Total listening time: {hhmmss(stats.total_listened)} over {stats.events} plays"]
+    lines.append("Most played tracks:")
+    lines += [f"  {count:5d}  {title}" for title, count in stats.most_played_tracks(n)]
+    lines.append("Most played artists:")
+    lines += [f"  {count:5d}  {artist}" for artist, count in stats.most_played_artists(n)]
+    return "\n".join(lines)
+
+
+def load_stats(log_path: Path = HISTORY_LOG, stats_path: Path = HISTORY_STATS) -> HistoryStats:
+    """Read-only view of the aggregates (safe while the player is running)."""
+    stats, offset = HistoryStats(), None
+    try:
+        snap = json.loads(stats_path.read_bytes())
+        with open(log_path, "rb") as f:
+            log_gen = int(json.loads(f.readline())["gen"])
+        if int(snap["gen"]) > log_gen:
+            return HistoryStats.from_json(snap["stats"])  # snapshot covers the whole log
+        if int(snap["gen"]) == log_gen:
+            stats, offset = HistoryStats.from_json(snap["stats"]), int(snap["offset"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    try:
+        with open(log_path, "rb") as f:
+            f.readline()
+            if offset is not None:
+                f.seek(max(offset, f.tell()))
+            for line in f:
+                ev = _parse(line) if line.endswith(b"\n") else None
+                if ev is not None:
+                    stats.apply(ev)
+    except OSError:
+        pass
+    return stats
+
+
+def main() -> int:
+    print(report(load_stats()))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
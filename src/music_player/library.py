@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===========================================================================
+Project: Python Music Player (Tkinter + pygame)
+File: library.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2026-10-19
+Updated: 2026-10-19
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Description:
+Music library made of several root folders.
+
+Notes:
+- Each root is scanned by its own worker, which also reads the tracks'
+  metadata, so a slow network mount only delays its own results and never
+  the UI thread.
+- Every root keeps its own sorted track list; the global order is produced by
+  a streaming k-way merge (`heapq.merge`) rather than re-sorting everything.
+- Adding or removing a root never rescans the others.
+
+===========================================================================
+"""
+from __future__ import annotations
+
+import heapq
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from .config import LIBRARY_SCAN_WORKERS
+from .utils import TrackMeta, read_metadata, scan_folder
+
+
+@dataclass
+class RootScan:
+    root: Path
+    tracks: list[TrackMeta] = field(default_factory=list)  # sorted by path
+    elapsed: Optional[float] = None  # seconds; None while scanning
+    error: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.elapsed is not None
+
+    @property
+    def paths(self) -> list[Path]:
+        return [t.path for t in self.tracks]
+
+    def summary(self) -> str:
+        if not self.done:
+            return f"{self.root}: scanning…"
+        if self.error:
+            return f"{self.root}: failed after {self.elapsed:.2f}s ({self.error})"
+        return f"{self.root}: {len(self.tracks)} tracks in {self.elapsed:.2f}s"
+
+
+class Library:
+    def __init__(self, workers: int = LIBRARY_SCAN_WORKERS) -> None:
+        self._scans: dict[Path, RootScan] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="library")
+
+    @staticmethod
+    def _key(root: Path) -> Path:
+        # abspath, not resolve(): resolving can block on a dead network mount
+        return Path(os.path.abspath(os.path.expanduser(root)))
+
+    # ---------- roots ----------
+    @property
+    def roots(self) -> list[Path]:
+        with self._lock:
+            return sorted(self._scans)
+
+    def add_root(self, root: Path) -> Future:
+        """Scan `root` in the background (rescans it if already present)."""
+        root = self._key(root)
+        scan = RootScan(root)
+        with self._lock:
+            self._scans[root] = scan
+        return self._pool.submit(self._scan, scan)
+
+    def remove_root(self, root: Path) -> bool:
+        with self._lock:
+            return self._scans.pop(self._key(root), None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._scans.clear()
+
+    def scanning(self) -> bool:
+        with self._lock:
+            return any(not s.done for s in self._scans.values())
+
+    def scans(self) -> list[RootScan]:
+        with self._lock:
+            return [self._scans[r] for r in sorted(self._scans)]
+
+    def _scan(self, scan: RootScan) -> RootScan:
+        t0 = time.perf_counter()
+        try:
+            tracks = [read_metadata(p) for p in scan_folder(scan.root)]
+            error = None
+        except Exception as exc:
+            # any failure must still mark the root done, or scanning() never settles
+            tracks, error = [], str(exc) or type(exc).__name__
+        with self._lock:
+            # a root removed or re-added meanwhile has a different RootScan object
+            scan.tracks = tracks
+            scan.error = error
+            scan.elapsed = time.perf_counter() - t0
+        return scan
+
+    # ---------- merged view ----------
+    def iter_tracks(self) -> Iterator[TrackMeta]:
+        """All finished roots' tracks in global path order, without duplicates."""
+        with self._lock:
+            lists = [s.tracks for s in self._scans.values() if s.done]
+        last: Optional[Path] = None
+        for t in heapq.merge(*lists, key=lambda t: t.path):
+            if t.path != last:  # nested/overlapping roots
+                yield t
+                last = t.path
+
+    def tracks(self) -> list[TrackMeta]:
+        return list(self.iter_tracks())
+
+    def paths(self) -> list[Path]:
+        return [t.path for t in self.iter_tracks()]
+
+    def report(self) -> str:
+        scans = self.scans()
+        wall = max((s.elapsed or 0.0 for s in scans), default=0.0)
+        total = sum(len(s.tracks) for s in scans)
+        lines = [s.summary() for s in scans]
+        lines.append(f"{total} tracks from {len(scans)} roots, slowest root {wall:.2f}s")
+        return "\n".join(lines)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def scan_roots(roots: Iterable[Path], workers: int = LIBRARY_SCAN_WORKERS) -> Library:
+    """Build a library from `roots`, blocking until every root is scanned."""
+    lib = Library(workers=workers)
+    for fut in [lib.add_root(r) for r in roots]:
+        fut.result()
+    return lib
@@ -6,29 +6,29 @@ Project: Python Music Player (Tkinter + pygame)
 File: player.py
 Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
 Created: 2025-10-26
-Updated: 2025-10-26
+Updated: 2026-10-19
 License: MIT License (see LICENSE file for details)
 ===========================================================================
 
 Description:
 Thin wrapper over pygame.mixer.music providing play/pause/seek and position
-tracking. Uses best-effort timing for progress bar.
+tracking via `PlaybackClock`.
 
 Notes:
-- pygame's `get_pos()` returns time since last `play()` in ms. We keep an
-  internal offset to derive absolute position across pauses and seeks.
+- pygame's `get_pos()` returns time since last `play()` in ms. The clock keeps
+  the segment start to derive absolute position across pauses and seeks.
 - Seeking is best-effort and may have codec limitations; MP3/OGG generally OK.
 
 ===========================================================================
 """
 from __future__ import annotations
 
-import time
 from pathlib import Path
 from typing import Optional
 
 import pygame
 
+from .clock import PlaybackClock
 from .config import DEFAULT_VOLUME
 from .utils import read_metadata, TrackMeta
 
@@ -37,8 +37,7 @@ class Player:
     def __init__(self) -> None:
         pygame.mixer.init()
         self._current: Optional[TrackMeta] = None
-        self._start_epoch: Optional[float] = None
-        self._offset: float = 0.0
+        self._clock = PlaybackClock()
         self._paused: bool = False
         pygame.mixer.music.set_volume(DEFAULT_VOLUME)
 
@@ -47,47 +46,42 @@ class Player:
         meta = read_metadata(path)
         pygame.mixer.music.load(str(path))
         self._current = meta
-        self._start_epoch = None
-        self._offset = 0.0
+        self._clock.reset()
         self._paused = False
         return meta
 
     def play(self, start: float = 0.0) -> None:
         if self._current is None:
             return
-        if start > 0:
-            self._offset = start
-        pygame.mixer.music.play(start=self._offset)
-        self._start_epoch = time.time()
+        offset = start if start > 0 else self._clock.position()
+        pygame.mixer.music.play(start=offset)
+        self._clock.start(offset)
         self._paused = False
 
     def pause(self) -> None:
         if not self._paused:
             pygame.mixer.music.pause()
             self._paused = True
-            if self._start_epoch is not None:
-                self._offset += time.time() - self._start_epoch
-                self._start_epoch = None
+            self._clock.pause()
 
     def resume(self) -> None:
         if self._paused:
             pygame.mixer.music.unpause()
             self._paused = False
-            self._start_epoch = time.time()
+            self._clock.resume()
 
     def stop(self) -> None:
         pygame.mixer.music.stop()
         self._paused = False
-        self._start_epoch = None
-        self._offset = 0.0
+        self._clock.reset()
 
     def seek(self, position: float) -> None:
         """Seek to absolute position in seconds."""
         if self._current is None:
             return
-        self._offset = max(0.0, position)
-        pygame.mixer.music.play(start=self._offset)
-        self._start_epoch = time.time()
+        offset = max(0.0, position)
+        pygame.mixer.music.play(start=offset)
+        self._clock.start(offset)
         self._paused = False
 
     # ---------- state ----------
@@ -100,9 +94,13 @@ class Player:
     def position(self) -> float:
         if self._current is None:
             return 0.0
-        if self._paused or self._start_epoch is None:
-            return self._offset
-        return self._offset + (time.time() - self._start_epoch)
+        pos = self._clock.position(mixer_ms=pygame.mixer.music.get_pos)
+        dur = self._current.duration
+        return min(pos, dur) if dur else pos
+
+    def position_error(self) -> float:
+        """Recent average disagreement between the clock and the mixer, in seconds."""
+        return self._clock.error
 
     def duration(self) -> Optional[float]:
         return None if self._current is None else self._current.duration
@@ -6,12 +6,13 @@ Project: Python Music Player (Tkinter + pygame)
 File: playlist.py
 Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
 Created: 2025-10-26
-Updated: 2025-10-26
+Updated: 2026-10-19
 License: MIT License (see LICENSE file for details)
 ===========================================================================
 
 Description:
-Playlist model with cursor, shuffle and repeat modes.
+Playlist model with cursor, shuffle and repeat modes, and optional hiding of
+duplicate tracks.
 
 ===========================================================================
 """
@@ -39,18 +40,61 @@ class Playlist:
         self._cursor: int = 0
         self.shuffle: bool = False
         self.repeat: str = RepeatMode.OFF
+        self.hide_duplicates: bool = False
+        self._duplicates: set[int] = set()  # indices into _tracks hidden when hide_duplicates
+        self._duplicate_groups: list[list[Path]] = []  # last `set_duplicates` input
 
     # ---------- building ----------
     def load_paths(self, paths: list[Path]) -> None:
-        self._tracks = [read_metadata(p) for p in paths]
-        self._reset_order()
+        # reuse metadata for tracks we already have
+        known = {t.path: t for t in self._tracks}
+        self.load_tracks([known.get(p) or read_metadata(p) for p in paths])
 
-    def _reset_order(self) -> None:
-        self._order = list(range(len(self._tracks)))
+    def load_tracks(self, tracks: list[TrackMeta]) -> None:
+        """Replace the tracks with already-read metadata (e.g. from `Library`)."""
+        current = self.current()
+        self._tracks = list(tracks)
+        self._mark_duplicates()
+        idx = -1 if current is None else self.index_of_path(current.path)
+        self._reset_order(keep=idx)
+        if idx >= 0:
+            self.set_cursor_by_index(idx)
+
+    def set_duplicates(self, groups: list[list[Path]]) -> None:
+        """Mark all but the first path of each group (see `dedupe.find_duplicates`)."""
+        self._duplicate_groups = groups
+        self._mark_duplicates()
+        self._reset_order_keep_current()
+
+    def _mark_duplicates(self) -> None:
+        # re-derived after every load so marks survive library roots changing;
+        # the first copy still present in each group stays visible
+        index = {t.path: i for i, t in enumerate(self._tracks)}
+        self._duplicates = set()
+        for group in self._duplicate_groups:
+            present = [index[p] for p in group if p in index]
+            self._duplicates.update(present[1:])
+
+    def _reset_order(self, keep: int = -1) -> None:
+        # `keep` stays in the order even if hidden, so the playing track isn't
+        # yanked away; it drops out on the next reset once playback moved on
+        self._order = [
+            i
+            for i in range(len(self._tracks))
+            if i == keep or not (self.hide_duplicates and i in self._duplicates)
+        ]
         if self.shuffle:
             random.shuffle(self._order)
         self._cursor = 0
 
+    def _reset_order_keep_current(self) -> None:
+        current = self.current()
+        idx = -1 if current is None else self.index_of_path(current.path)
+        self._reset_order(keep=idx)
+        if current is not None:
+            # keep current track as active
+            self.set_cursor_by_index(idx)
+
     # ---------- querying ----------
     def __len__(self) -> int:
         return len(self._tracks)
@@ -110,12 +154,11 @@ class Playlist:
     # ---------- modes ----------
     def toggle_shuffle(self) -> None:
         self.shuffle = not self.shuffle
-        current = self.current()
-        self._reset_order()
-        if current is not None:
-            # keep current track as active
-            idx = self.index_of_path(current.path)
-            self.set_cursor_by_index(idx)
+        self._reset_order_keep_current()
+
+    def toggle_hide_duplicates(self) -> None:
+        self.hide_duplicates = not self.hide_duplicates
+        self._reset_order_keep_current()
 
     def cycle_repeat(self) -> str:
         order = [RepeatMode.OFF, RepeatMode.ONE, RepeatMode.ALL]
@@ -129,4 +172,8 @@ class Playlist:
 
     @property
     def order(self) -> List[int]:
-        return list(self._order)
\ No newline at end of file
+        return list(self._order)
+
+    @property
+    def duplicate_count(self) -> int:
+        return len(self._duplicates)
\ No newline at end of file
@@ -6,25 +6,33 @@ Project: Python Music Player (Tkinter + pygame)
 File: ui.py
 Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
 Created: 2025-10-26
-Updated: 2025-10-26
+Updated: 2026-10-19
 License: MIT License (see LICENSE file for details)
 ===========================================================================
 
 Description:
-Tkinter UI: menu, playlist view, transport controls, seekbar, volume, status bar.
+Tkinter UI: menu, playlist view, transport controls, seekbar, volume, status bar,
+cover art.
 
 ===========================================================================
 """
 from __future__ import annotations
 
+import math
+import time
 import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from tkinter import filedialog, ttk, messagebox
 
-from .config import TICK_MS
+from .artwork import ArtworkLoader, ThumbnailCache
+from .config import ART_CACHE_DIR, ART_POLL_MS, NOW_PLAYING_ART_SIZE, ROW_ART_SIZE, TICK_MS
+from .dedupe import find_duplicates
+from .history import PlayEvent, PlayHistory, report
+from .library import Library, RootScan
 from .player import Player
 from .playlist import Playlist, RepeatMode
-from .utils import TrackMeta, hhmmss, scan_folder
+from .utils import TrackMeta, hhmmss
 
 
 class MusicPlayerApp(ttk.Frame):
@@ -39,6 +47,26 @@ class MusicPlayerApp(ttk.Frame):
         # Core
         self.player = Player()
         self.playlist = Playlist()
+        self.library = Library()
+        self._library_poll_id = None
+        self._applied_scans: dict[int, RootScan] = {}  # finished scans already in the playlist
+        self.artwork = ArtworkLoader(ThumbnailCache(ART_CACHE_DIR))
+        self.history = PlayHistory()
+        self._play_started: float | None = None  # epoch of the play being tracked
+
+        # Artwork view state
+        self.show_art_var = tk.BooleanVar(value=False)
+        self._tree_items: list[str] = []  # view position -> tree item id
+        self._item_tracks: dict[str, TrackMeta] = {}  # tree item id -> track shown
+        self._path_items: dict[Path, str] = {}
+        self._art_items: set[str] = set()  # rows currently showing a thumbnail
+        self._now_art = None  # keep a reference so Tk doesn't drop the image
+        self._art_poll_id = None
+
+        # Background jobs (duplicate scan)
+        self._jobs = ThreadPoolExecutor(max_workers=1, thread_name_prefix="jobs")
+        self._dedupe_future: Future | None = None
+        self.hide_dupes_var = tk.BooleanVar(value=False)
 
         # UI
         self._build_menu()
@@ -52,15 +80,39 @@ class MusicPlayerApp(ttk.Frame):
         menubar = tk.Menu(self.master)
         filemenu = tk.Menu(menubar, tearoff=False)
         filemenu.add_command(label="Open Folder…", command=self._open_folder)
+        filemenu.add_command(label="Add Folder to Library…", command=self._add_folder)
+        self._roots_menu = tk.Menu(filemenu, tearoff=False)
+        filemenu.add_cascade(label="Remove Folder from Library", menu=self._roots_menu)
+        filemenu.add_command(label="Library Scan Report", command=self._show_library_report)
         filemenu.add_separator()
-        filemenu.add_command(label="Exit", command=self.master.destroy)
+        filemenu.add_command(label="Exit", command=self._quit)
         menubar.add_cascade(label="File", menu=filemenu)
+        self.master.protocol("WM_DELETE_WINDOW", self._quit)
 
         viewmenu = tk.Menu(menubar, tearoff=False)
         viewmenu.add_command(label="Shuffle", command=self._toggle_shuffle)
         viewmenu.add_command(label="Repeat", command=self._cycle_repeat)
         menubar.add_cascade(label="Playback", menu=viewmenu)
 
+        artmenu = tk.Menu(menubar, tearoff=False)
+        artmenu.add_checkbutton(
+            label="Artwork Column",
+            variable=self.show_art_var,
+            command=self._toggle_art_column,
+            state="normal" if self.artwork.enabled else "disabled",
+        )
+        artmenu.add_checkbutton(
+            label="Hide Duplicates",
+            variable=self.hide_dupes_var,
+            command=self._toggle_hide_duplicates,
+        )
+        menubar.add_cascade(label="View", menu=artmenu)
+
+        toolsmenu = tk.Menu(menubar, tearoff=False)
+        toolsmenu.add_command(label="Find Duplicates", command=self._find_duplicates)
+        toolsmenu.add_command(label="Play Statistics", command=self._show_stats)
+        menubar.add_cascade(label="Tools", menu=toolsmenu)
+
         self.master.config(menu=menubar)
 
     def _build_main(self) -> None:
@@ -85,11 +137,13 @@ class MusicPlayerApp(ttk.Frame):
         self.tree.column("artist", width=150)
         self.tree.column("album", width=150)
         self.tree.column("dur", width=80, anchor="e")
+        self.tree.column("#0", width=ROW_ART_SIZE + 12, stretch=False)
         self.tree.grid(row=1, column=0, sticky="nsew")
+        ttk.Style(self.master).configure("Art.Treeview", rowheight=ROW_ART_SIZE + 4)
 
-        vs = ttk.Scrollbar(left, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=vs.set)
-        vs.grid(row=1, column=1, sticky="ns")
+        self._tree_vs = ttk.Scrollbar(left, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_tree_scroll)
+        self._tree_vs.grid(row=1, column=1, sticky="ns")
 
         self.tree.bind("<Double-1>", self._on_tree_double_click)
 
@@ -98,24 +152,26 @@ class MusicPlayerApp(ttk.Frame):
         right.grid(row=0, column=1, sticky="nsew")
         self.columnconfigure(1, weight=0)
 
+        self.now_art = ttk.Label(right)
+        self.now_art.grid(row=0, column=0, sticky="w", pady=(0, 8))
         self.now_title = ttk.Label(right, text="Open a folder to start", font=("Segoe UI", 12, "bold"))
-        self.now_title.grid(row=0, column=0, sticky="w")
+        self.now_title.grid(row=1, column=0, sticky="w")
         self.now_meta = ttk.Label(right, text="", foreground="#666")
-        self.now_meta.grid(row=1, column=0, sticky="w", pady=(0, 10))
+        self.now_meta.grid(row=2, column=0, sticky="w", pady=(0, 10))
 
         # Seek bar
         self.seek_var = tk.DoubleVar(value=0.0)
         self.seek = ttk.Scale(right, orient="horizontal", from_=0.0, to=100.0, variable=self.seek_var)
-        self.seek.grid(row=2, column=0, sticky="ew")
+        self.seek.grid(row=3, column=0, sticky="ew")
         right.columnconfigure(0, weight=1)
         self.seek.bind("<ButtonRelease-1>", self._on_seek)
 
         self.time_label = ttk.Label(right, text="00:00 / 00:00")
-        self.time_label.grid(row=3, column=0, sticky="w", pady=(2, 10))
+        self.time_label.grid(row=4, column=0, sticky="w", pady=(2, 10))
 
         # Transport controls
         ctrl = ttk.Frame(right)
-        ctrl.grid(row=4, column=0, pady=8, sticky="w")
+        ctrl.grid(row=5, column=0, pady=8, sticky="w")
         ttk.Button(ctrl, text="⏮ Prev", command=self._prev).grid(row=0, column=0, padx=2)
         self.play_btn = ttk.Button(ctrl, text="▶️ Play", command=self._play_pause)
         self.play_btn.grid(row=0, column=1, padx=2)
@@ -127,7 +183,7 @@ class MusicPlayerApp(ttk.Frame):
 
         # Volume
         vol_frame = ttk.Frame(right)
-        vol_frame.grid(row=5, column=0, sticky="ew", pady=8)
+        vol_frame.grid(row=6, column=0, sticky="ew", pady=8)
         ttk.Label(vol_frame, text="🔊 Volume").grid(row=0, column=0, padx=(0, 8))
         self.vol_var = tk.DoubleVar(value=70)
         self.vol = ttk.Scale(vol_frame, orient="horizontal", from_=0, to=100, variable=self.vol_var,
@@ -153,13 +209,66 @@ class MusicPlayerApp(ttk.Frame):
         folder = filedialog.askdirectory(title="Select Music Folder")
         if not folder:
             return
-        paths = scan_folder(Path(folder))
-        if not paths:
-            messagebox.showinfo("No audio", "No supported audio files found in this folder.")
+        self.library.clear()
+        self._scan_root(Path(folder))
+
+    def _add_folder(self) -> None:
+        folder = filedialog.askdirectory(title="Add Music Folder to Library")
+        if not folder:
             return
-        self.playlist.load_paths(paths)
+        self._scan_root(Path(folder))
+
+    def _scan_root(self, root: Path) -> None:
+        self.library.add_root(root)
+        self._refresh_roots_menu()
+        self.status.config(text=f"Scanning {root}…")
+        if self._library_poll_id is None:
+            self._library_poll_id = self.after(TICK_MS, self._poll_library)
+
+    def _remove_root(self, root: Path) -> None:
+        if self.library.remove_root(root):
+            self._refresh_roots_menu()
+            self._apply_library()
+
+    def _refresh_roots_menu(self) -> None:
+        self._roots_menu.delete(0, "end")
+        for root in self.library.roots:
+            self._roots_menu.add_command(
+                label=str(root), command=lambda r=root: self._remove_root(r)
+            )
+
+    def _poll_library(self) -> None:
+        self._library_poll_id = None
+        scans = self.library.scans()
+        # hold references so ids of finished scans can't be reused by new ones
+        finished = {id(s): s for s in scans if s.done}
+        if finished.keys() - self._applied_scans.keys():
+            # a root finished since the last poll: show it without waiting for slower roots
+            self._apply_library()
+        self._applied_scans = finished
+        if len(finished) < len(scans):
+            self._library_poll_id = self.after(TICK_MS, self._poll_library)
+
+    def _apply_library(self) -> None:
+        # always reload, even when empty: removed/replaced roots must leave the playlist
+        tracks = self.library.tracks()  # metadata was read on the scan workers
+        self.playlist.load_tracks(tracks)
         self._refresh_playlist_view()
-        self.status.config(text=f"Loaded {len(paths)} tracks from {folder}")
+        if not tracks and self.library.roots and not self.library.scanning():
+            messagebox.showinfo(
+                "No audio", "No supported audio files found in the library folders."
+            )
+        scans = self.library.scans()
+        timings = ", ".join(
+            f"{s.root.name or s.root} {s.elapsed:.2f}s" if s.done else f"{s.root.name or s.root} …"
+            for s in scans
+        )
+        self.status.config(
+            text=f"Loaded {len(tracks)} tracks from {len(scans)} folders ({timings})"
+        )
+
+    def _show_library_report(self) -> None:
+        messagebox.showinfo("Library", self.library.report())
 
     def _play_pause(self) -> None:
         cur = self.playlist.current()
@@ -229,14 +338,87 @@ class MusicPlayerApp(ttk.Frame):
         self.vol_var.set(v)
         self._on_volume()
 
+    def _toggle_art_column(self) -> None:
+        if self.show_art_var.get():
+            self.tree.configure(show="tree headings", style="Art.Treeview")
+        else:
+            self.tree.configure(show="headings", style="Treeview")
+            for item in self._art_items:
+                self.tree.item(item, image="")
+            self._art_items.clear()
+        self._update_visible_art()
+
+    def _find_duplicates(self) -> None:
+        if self._dedupe_future is not None or not len(self.playlist):
+            return
+        self.status.config(text=f"Scanning {len(self.playlist)} tracks for duplicates…")
+        self._dedupe_future = self._jobs.submit(find_duplicates, self.playlist.tracks)
+        self.after(TICK_MS, self._poll_duplicates)
+
+    def _poll_duplicates(self) -> None:
+        fut = self._dedupe_future
+        if fut is None:
+            return
+        if not fut.done():
+            self.after(TICK_MS, self._poll_duplicates)
+            return
+        self._dedupe_future = None
+        try:
+            groups = fut.result()
+        except Exception as exc:
+            self.status.config(text=f"Duplicate scan failed: {exc}")
+            return
+        self.playlist.set_duplicates(groups)
+        self._refresh_playlist_view()
+        self.status.config(
+            text=f"Found {self.playlist.duplicate_count} duplicates in {len(groups)} groups"
+        )
+
+    def _toggle_hide_duplicates(self) -> None:
+        self.playlist.toggle_hide_duplicates()
+        self.hide_dupes_var.set(self.playlist.hide_duplicates)
+        self._refresh_playlist_view()
+
+    def _show_stats(self) -> None:
+        messagebox.showinfo("Play Statistics", report(self.history.stats))
+
+    def _quit(self) -> None:
+        self._finish_play(completed=False)
+        self.history.close()
+        self.artwork.shutdown()
+        self.library.shutdown()
+        self._jobs.shutdown(wait=False, cancel_futures=True)
+        self.master.destroy()
+
     # -------------------- Helpers --------------------
     def _load_and_play(self, track: TrackMeta) -> None:
+        self._finish_play(completed=False)
         meta = self.player.load(track.path)
         self.player.play()
+        self._play_started = time.time()
         self.play_btn.config(text="⏸ Pause")
         self._update_now_playing(meta)
         self._highlight_current_in_tree()
 
+    def _finish_play(self, completed: bool) -> None:
+        """Log the play in progress (if any) to history."""
+        cur = self.player.current()
+        if self._play_started is None or cur is None:
+            return
+        dur = self.player.duration() or 0.0
+        listened = dur if completed else min(self.player.position(), dur or float("inf"))
+        self.history.record(
+            PlayEvent(
+                path=str(cur.path),
+                title=cur.title,
+                artist=cur.artist,
+                started=self._play_started,
+                listened=listened,
+                completed=completed,
+            )
+        )
+        self._play_started = None
+
     def _update_now_playing(self, meta: TrackMeta) -> None:
         self.now_title.config(text=meta.title)
         details = []
@@ -245,13 +427,103 @@ class MusicPlayerApp(ttk.Frame):
         if meta.album:
             details.append(meta.album)
         self.now_meta.config(text=" • ".join(details))
+        self._update_now_art()
+
+    def _update_now_art(self) -> None:
+        cur = self.player.current()
+        img = None
+        if cur is not None:
+            img = self.artwork.get(cur.path, NOW_PLAYING_ART_SIZE)
+            if img is None and not self.artwork.has_no_art(cur.path):
+                self.artwork.request(cur.path, NOW_PLAYING_ART_SIZE)
+                self._schedule_art_poll()
+        self._now_art = img
+        self.now_art.config(image=img or "")
 
     def _refresh_playlist_view(self) -> None:
-        self.tree.delete(*self.tree.get_children())
-        for idx in self.playlist.order:
-            t = self.playlist.tracks[idx]
-            self.tree.insert("", "end", values=(t.title, t.artist or "", t.album or "", hhmmss(t.duration)))
+        """Sync the tree with the playlist order, touching only rows that changed."""
+        tracks = [self.playlist.tracks[idx] for idx in self.playlist.order]
+        wanted = {t.path for t in tracks}
+        stale = {item for item, t in self._item_tracks.items() if t.path not in wanted}
+        kept = [i for i in self._tree_items if i not in stale]
+        if len(wanted) < len(tracks) or kept != [
+            self._path_items[t.path] for t in tracks if t.path in self._path_items
+        ]:
+            # reordered (e.g. shuffle) or ambiguous: moving every row costs as much as rebuilding
+            stale = set(self._item_tracks)
+        if stale:
+            self.tree.delete(*stale)
+            for item in stale:
+                del self._path_items[self._item_tracks.pop(item).path]
+            self._art_items.difference_update(stale)
+
+        self._tree_items = []
+        for pos, t in enumerate(tracks):
+            values = (t.title, t.artist or "", t.album or "", hhmmss(t.duration))
+            item = self._path_items.get(t.path)
+            if item is None:
+                item = self.tree.insert("", pos, values=values)
+                self._path_items[t.path] = item
+            elif self._item_tracks[item] is not t:
+                self.tree.item(item, values=values)  # rescanned: tags may have changed
+            self._item_tracks[item] = t
+            self._tree_items.append(item)
         self._highlight_current_in_tree()
+        self._update_visible_art()
+
+    # -------------------- Artwork --------------------
+    def _on_tree_scroll(self, first: str, last: str) -> None:
+        self._tree_vs.set(first, last)
+        self._update_visible_art()
+
+    def _update_visible_art(self) -> None:
+        """Attach thumbnails to on-screen rows only.
+
+        Extraction and resizing run on workers; only the small cached PNG is
+        decoded on this thread, in `ArtworkLoader.drain()`.
+        """
+        if not self.show_art_var.get() or not self.artwork.enabled or not self._tree_items:
+            self.artwork.retain(ROW_ART_SIZE, ())
+            return
+        n = len(self._tree_items)
+        first, last = self.tree.yview()
+        visible = self._tree_items[int(first * n): min(n, math.ceil(last * n) + 1)]
+        # drop queued jobs for rows that scrolled away
+        self.artwork.retain(ROW_ART_SIZE, (self._item_tracks[item].path for item in visible))
+
+        for item in self._art_items.difference(visible):
+            self.tree.item(item, image="")
+        self._art_items.intersection_update(visible)
+
+        requested = False
+        for item in visible:
+            if item in self._art_items:
+                continue
+            path = self._item_tracks[item].path
+            img = self.artwork.get(path, ROW_ART_SIZE)
+            if img is not None:
+                self.tree.item(item, image=img)
+                self._art_items.add(item)
+            elif not self.artwork.has_no_art(path):
+                self.artwork.request(path, ROW_ART_SIZE)
+                requested = True
+        if requested:
+            self._schedule_art_poll()
+
+    def _schedule_art_poll(self) -> None:
+        if self._art_poll_id is None:
+            self._art_poll_id = self.after(ART_POLL_MS, self._poll_artwork)
+
+    def _poll_artwork(self) -> None:
+        self._art_poll_id = None
+        done = self.artwork.drain()
+        cur = self.player.current()
+        if cur is not None and (cur.path, NOW_PLAYING_ART_SIZE) in done:
+            self._update_now_art()
+        if any(size == ROW_ART_SIZE for _, size in done):
+            self._update_visible_art()
+        if self.artwork.pending():
+            self._schedule_art_poll()
 
     def _highlight_current_in_tree(self) -> None:
         # highlight current row
@@ -279,6 +551,7 @@ class MusicPlayerApp(ttk.Frame):
 
         # if finished playing naturally, advance
         if not self.player.is_paused() and not self.player.is_playing() and dur > 0 and pos > 0:
+            self._finish_play(completed=True)
             nxt = self.playlist.next()
             if nxt is not None:
                 self._load_and_play(nxt)
@@ -0,0 +1,85 @@
+import io
+import time
+from pathlib import Path
+
+import pytest
+
+from music_player.artwork import ArtworkLoader, LRUCache, ThumbnailCache, extract_artwork
+
+
+def png_bytes(color, size=(200, 200)) -> bytes:
+    Image = pytest.importorskip("PIL.Image")
+    buf = io.BytesIO()
+    Image.new("RGB", size, color).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def test_lru_evicts_least_recently_used():
+    lru = LRUCache(2)
+    lru.put("a", 1)
+    lru.put("b", 2)
+    assert lru.get("a") == 1  # touch a
+    lru.put("c", 3)
+    assert "b" not in lru
+    assert lru.get("a") == 1 and lru.get("c") == 3
+
+
+def test_folder_artwork_fallback(tmp_path: Path):
+    track = tmp_path / "song.mp3"
+    track.write_bytes(b"not really audio")
+    assert extract_artwork(track) is None
+    (tmp_path / "cover.jpg").write_bytes(b"jpeg-bytes")
+    assert extract_artwork(track) == b"jpeg-bytes"
+
+
+def test_thumbnail_cache_shares_identical_art(tmp_path: Path):
+    cache = ThumbnailCache(tmp_path)
+    art = png_bytes("red")
+    d1, png1 = cache.thumbnail(art, 32)
+    d2, png2 = cache.thumbnail(bytes(art), 32)
+    assert d1 == d2 and png1 == png2
+    assert [p.name for p in tmp_path.iterdir()] == [f"{d1}_32.png"]
+
+
+def test_loader_resolves_in_background(tmp_path: Path):
+    album = tmp_path / "album"
+    album.mkdir()
+    (album / "folder.jpg").write_bytes(png_bytes("blue"))
+    tracks = [album / f"{i}.mp3" for i in range(3)]
+    for t in tracks:
+        t.write_bytes(b"")
+
+    made = []
+
+    def factory(png: bytes) -> object:
+        made.append(object())
+        return made[-1]
+
+    loader = ArtworkLoader(ThumbnailCache(tmp_path / "cache"), photo_factory=factory)
+    for t in tracks:
+        loader.request(t, 32)
+    deadline = time.time() + 5
+    done = []
+    while loader.pending() and time.time() < deadline:
+        done += loader.drain()
+        time.sleep(0.01)
+    done += loader.drain()
+    loader.shutdown()
+
+    assert sorted(done) == sorted((t, 32) for t in tracks)
+    assert len(made) == 1  # shared art -> one PhotoImage
+    assert all(loader.get(t, 32) is made[0] for t in tracks)
+
+
+def test_loader_skips_jobs_no_longer_wanted(tmp_path: Path):
+    tracks = [tmp_path / f"{i}.mp3" for i in range(3)]
+    for t in tracks:
+        t.write_bytes(b"")
+    loader = ArtworkLoader(ThumbnailCache(tmp_path / "cache"), photo_factory=lambda png: png)
+    loader.retain(32, tracks[2:])
+    loader._work(tracks[0], 32)  # scrolled away: skipped, nothing published
+    loader._work(tracks[2], 32)
+    assert loader.drain() == []  # no art, but tracks[2] was processed
+    assert not loader.has_no_art(tracks[0])
+    assert loader.has_no_art(tracks[2])
+    loader.shutdown()
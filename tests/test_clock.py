@@ -0,0 +1,50 @@
+import pytest
+
+from music_player.clock import PlaybackClock
+
+
+class FakeTime:
+    def __init__(self) -> None:
+        self.t = 1000.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+def test_pause_freezes_position():
+    now = FakeTime()
+    clock = PlaybackClock(now=now)
+    clock.start(30.0)
+    now.t += 5
+    clock.pause()
+    now.t += 100
+    assert clock.position() == pytest.approx(35.0)
+    clock.resume()
+    now.t += 1
+    assert clock.position() == pytest.approx(36.0)
+
+
+def test_tracks_slow_audio_clock_over_long_play():
+    # audio runs 0.5% slower than the monotonic clock (e.g. device rate mismatch)
+    now = FakeTime()
+    clock = PlaybackClock(now=now)
+    clock.start(0.0)
+    mixed = 0.0
+    worst = 0.0
+    for _ in range(3 * 3600 * 2):  # three hours of 0.5 s UI ticks
+        now.t += 0.5
+        mixed += 0.5 * 0.995
+        pos = clock.position(mixer_ms=lambda: int(mixed * 1000))
+        worst = max(worst, abs(pos - mixed))
+    assert worst < 0.6  # never beyond a snap
+    assert abs(clock.position() - mixed) < 0.05
+    assert clock.drift == pytest.approx(-0.005, abs=1e-3)
+
+
+def test_large_error_snaps_to_mixer():
+    now = FakeTime()
+    clock = PlaybackClock(now=now)
+    clock.start(10.0)
+    now.t += 2
+    assert clock.position(mixer_ms=lambda: 0) == pytest.approx(10.0)  # stalled device
+    assert clock.last_error == pytest.approx(-2.0)
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from music_player.dedupe import audio_payload_range, find_duplicates
+from music_player.utils import TrackMeta
+
+
+def id3v2(body: bytes) -> bytes:
+    n = len(body)
+    size = bytes([(n >> 21) & 0x7F, (n >> 14) & 0x7F, (n >> 7) & 0x7F, n & 0x7F])
+    return b"ID3\x03\x00\x00" + size + body
+
+
+def write_mp3(path: Path, payload: bytes, tag: bytes = b"") -> TrackMeta:
+    path.write_bytes(id3v2(tag) + payload)
+    return TrackMeta(path=path, title=path.stem, artist=None, album=None, duration=180.0)
+
+
+def test_payload_range_skips_id3(tmp_path: Path):
+    meta = write_mp3(tmp_path / "a.mp3", b"\xff\xfb" * 100, tag=b"x" * 37)
+    assert audio_payload_range(meta.path) == (47, 247)
+
+
+def test_find_duplicates_ignores_tags(tmp_path: Path):
+    audio = bytes(range(256)) * 2048  # larger than the partial window
+    tracks = [
+        write_mp3(tmp_path / "a.mp3", audio, tag=b"artist A"),
+        write_mp3(tmp_path / "b.mp3", audio, tag=b"a much longer retagged artist"),
+        # same length, same head and tail, different middle
+        write_mp3(tmp_path / "c.mp3", audio[:200_000] + b"\x00" + audio[200_001:]),
+        write_mp3(tmp_path / "d.mp3", audio[:-1]),
+    ]
+    assert find_duplicates(tracks, workers=2) == [[tmp_path / "a.mp3", tmp_path / "b.mp3"]]
+
+
+def test_durations_straddling_rounding_boundary_still_match(tmp_path: Path):
+    audio = bytes(range(256)) * 512
+    a = write_mp3(tmp_path / "a.mp3", audio, tag=b"short")
+    b = write_mp3(tmp_path / "b.mp3", audio, tag=b"x" * 4096)
+    a.duration, b.duration = 30.39, 30.64  # tag size skews the estimate
+    assert find_duplicates([a, b], workers=2) == [[a.path, b.path]]
+
+
+def test_untimed_tracks_compare_payload_not_file_size(tmp_path: Path):
+    audio = bytes(range(256)) * 512
+    a = write_mp3(tmp_path / "a.mp3", audio, tag=b"short")
+    b = write_mp3(tmp_path / "b.mp3", audio, tag=b"x" * 4096)
+    a.duration = b.duration = None
+    assert find_duplicates([a, b], workers=2) == [[a.path, b.path]]
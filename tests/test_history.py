@@ -0,0 +1,89 @@
+import time
+from pathlib import Path
+from typing import Optional
+
+from music_player.history import PlayEvent, PlayHistory, load_stats
+
+
+def event(i: int, completed: bool = True, started: Optional[float] = None) -> PlayEvent:
+    return PlayEvent(
+        path=f"/music/t{i}.mp3",
+        title=f"T{i}",
+        artist="A" if i % 2 else "B",
+        started=time.time() if started is None else started,
+        listened=60.0,
+        completed=completed,
+    )
+
+
+def open_history(tmp_path: Path, flush_interval: float = 60, **kw) -> PlayHistory:
+    return PlayHistory(
+        tmp_path / "h.jsonl", tmp_path / "h.json", flush_interval=flush_interval, **kw
+    )
+
+
+def test_aggregates_survive_reopen(tmp_path: Path):
+    h = open_history(tmp_path)
+    for i in [1, 1, 2, 3]:
+        h.record(event(i))
+    h.record(event(2, completed=False))
+    h.close()
+
+    h = open_history(tmp_path)
+    assert h.stats.most_played_tracks(1) == [("T1", 2)]
+    assert h.stats.most_played_artists() == [("A", 3), ("B", 1)]
+    assert h.stats.total_listened == 300.0
+    h.close()
+    assert load_stats(tmp_path / "h.jsonl", tmp_path / "h.json").events == 5
+
+
+def test_torn_tail_is_dropped(tmp_path: Path):
+    h = open_history(tmp_path)
+    h.record(event(1))
+    h.close()
+    (tmp_path / "h.json").unlink()  # force a replay from the log
+    with open(tmp_path / "h.jsonl", "ab") as f:
+        f.write(b'{"path": "/music/t9.mp3", "tit')
+
+    h = open_history(tmp_path)
+    assert h.stats.events == 1
+    h.record(event(2))
+    h.close()
+    assert load_stats(tmp_path / "h.jsonl", tmp_path / "h.json").events == 2
+
+
+def test_compaction_drops_old_events_but_keeps_counts(tmp_path: Path):
+    h = open_history(tmp_path, compact_bytes=1, retention_days=1)
+    h.record(event(1, started=0.0))
+    h.record(event(2))
+    h.flush()
+    h._compact()
+    h.close()
+
+    lines = (tmp_path / "h.jsonl").read_bytes().splitlines()
+    assert len(lines) == 2  # header + the recent event
+    h = open_history(tmp_path)
+    assert h.stats.events == 2
+    h.close()
+
+
+def test_failed_compaction_keeps_writer_alive(tmp_path: Path, monkeypatch):
+    h = open_history(tmp_path, flush_interval=0.01, compact_bytes=1)
+
+    def disk_full() -> None:
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(h, "_rewrite_log", disk_full)
+    h.record(event(1))
+    deadline = time.time() + 5
+    while h._compact_at <= 1 and time.time() < deadline:
+        time.sleep(0.01)
+    assert h._thread.is_alive()
+    assert h._gen == 0
+
+    h.record(event(2))
+    while h._buffer and time.time() < deadline:
+        time.sleep(0.01)
+    assert not h._buffer  # written by the writer thread, not close()
+    h.close()
+    assert load_stats(tmp_path / "h.jsonl", tmp_path / "h.json").events == 2
@@ -0,0 +1,76 @@
+import threading
+from pathlib import Path
+
+from music_player import library as library_mod
+from music_player.library import Library, scan_roots
+
+
+def make_tree(root: Path, names: list[str]) -> list[Path]:
+    out = []
+    for name in names:
+        p = root / name
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_bytes(b"")
+        out.append(p)
+    return out
+
+
+def test_roots_merge_in_global_order(tmp_path: Path):
+    a = make_tree(tmp_path / "a", ["z.mp3", "x/1.flac", "notes.txt"])
+    b = make_tree(tmp_path / "b", ["m.ogg", "c/2.wav"])
+    lib = scan_roots([tmp_path / "b", tmp_path / "a"])
+    expected = sorted(p for p in a + b if p.suffix != ".txt")
+    assert lib.paths() == expected
+    assert all(s.elapsed is not None and s.error is None for s in lib.scans())
+    lib.shutdown()
+
+
+def test_nested_roots_do_not_duplicate(tmp_path: Path):
+    make_tree(tmp_path / "a", ["1.mp3", "sub/2.mp3"])
+    lib = scan_roots([tmp_path / "a", tmp_path / "a" / "sub"])
+    assert len(lib.paths()) == 2
+    lib.shutdown()
+
+
+def test_add_and_remove_do_not_rescan_other_roots(tmp_path: Path, monkeypatch):
+    make_tree(tmp_path / "a", ["1.mp3"])
+    make_tree(tmp_path / "b", ["2.mp3"])
+    scanned = []
+    real_scan = library_mod.scan_folder
+    monkeypatch.setattr(library_mod, "scan_folder", lambda r: scanned.append(r) or real_scan(r))
+
+    lib = Library()
+    lib.add_root(tmp_path / "a").result()
+    lib.add_root(tmp_path / "b").result()
+    assert lib.remove_root(tmp_path / "a")
+    assert lib.paths() == [tmp_path / "b" / "2.mp3"]
+    assert scanned == [tmp_path / "a", tmp_path / "b"]
+    lib.shutdown()
+
+
+def test_failed_scan_is_marked_done(tmp_path: Path, monkeypatch):
+    def boom(root: Path) -> list[Path]:
+        raise RuntimeError("mount went away")
+
+    monkeypatch.setattr(library_mod, "scan_folder", boom)
+    lib = Library()
+    scan = lib.add_root(tmp_path).result()
+    assert not lib.scanning()
+    assert scan.error == "mount went away" and lib.paths() == []
+    lib.shutdown()
+
+
+def test_metadata_is_read_on_scan_workers(tmp_path: Path, monkeypatch):
+    make_tree(tmp_path / "a", ["1.mp3", "2.mp3"])
+    threads = []
+    real_read = library_mod.read_metadata
+
+    def read(p: Path):
+        threads.append(threading.current_thread().name)
+        return real_read(p)
+
+    monkeypatch.setattr(library_mod, "read_metadata", read)
+    lib = scan_roots([tmp_path / "a"])
+    assert [t.title for t in lib.tracks()] == ["1", "2"]
+    assert len(threads) == 2 and all(n.startswith("library") for n in threads)
+    lib.shutdown()
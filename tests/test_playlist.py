@@ -36,4 +36,56 @@ def test_shuffle_toggle_keeps_current():
     pl._reset_order()
     current_path = pl.current().path
     pl.toggle_shuffle()
-    assert pl.current().path == current_path
\ No newline at end of file
+    assert pl.current().path == current_path
+
+
+def test_hide_duplicates_filters_order():
+    pl = Playlist()
+    pl._tracks = [fake_track(i) for i in range(4)]
+    pl._reset_order()
+    pl.set_duplicates([[Path("/tmp/t0.mp3"), Path("/tmp/t2.mp3")]])
+    assert pl.order == [0, 1, 2, 3]  # nothing hidden until enabled
+    pl.toggle_hide_duplicates()
+    assert pl.order == [0, 1, 3]
+    assert pl.duplicate_count == 1
+
+
+def test_hiding_playing_duplicate_keeps_position():
+    pl = Playlist()
+    pl._tracks = [fake_track(i) for i in range(4)]
+    pl._reset_order()
+    pl.next()
+    pl.next()  # T2 playing
+    pl.set_duplicates([[Path("/tmp/t0.mp3"), Path("/tmp/t2.mp3")]])
+    pl.toggle_hide_duplicates()
+    assert pl.current().title == "T2"
+    assert pl.next().title == "T3"
+
+
+def test_duplicate_marks_survive_reload(monkeypatch):
+    monkeypatch.setattr(
+        "music_player.playlist.read_metadata", lambda p: fake_track(int(p.stem[1:]))
+    )
+    pl = Playlist()
+    pl.load_paths([Path(f"/tmp/t{i}.mp3") for i in range(4)])
+    pl.set_duplicates([[Path("/tmp/t0.mp3"), Path("/tmp/t2.mp3"), Path("/tmp/t3.mp3")]])
+    pl.toggle_hide_duplicates()
+    assert [t.title for t in (pl.at(i) for i in pl.order)] == ["T0", "T1"]
+
+    # another root added: t2/t3 stay hidden
+    pl.load_paths([Path(f"/tmp/t{i}.mp3") for i in range(5)])
+    assert [t.title for t in (pl.at(i) for i in pl.order)] == ["T0", "T1", "T4"]
+
+    # the kept copy's root removed: the next copy becomes visible
+    pl.load_paths([Path(f"/tmp/t{i}.mp3") for i in range(1, 5)])
+    assert [t.title for t in (pl.at(i) for i in pl.order)] == ["T1", "T2", "T4"]
+
+
+def test_load_tracks_keeps_current_without_reading_tags(monkeypatch):
+    monkeypatch.setattr("music_player.playlist.read_metadata", lambda p: 1 / 0)
+    pl = Playlist()
+    pl.load_tracks([fake_track(i) for i in range(3)])
+    pl.next()  # T1 playing
+    pl.load_tracks([fake_track(i) for i in range(5)])
+    assert pl.current().title == "T1"
+    assert [t.title for t in (pl.at(i) for i in pl.order)] == ["T0", "T1", "T2", "T3", "T4"]